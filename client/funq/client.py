@@ -43,12 +43,11 @@ import errno
 import os
 import shlex
 import subprocess
-import base64
 from collections import defaultdict
 import logging
 
 from funq.aliases import HooqAliases
-from funq.tools import wait_for
+from funq.tools import wait_for, json_dumps, json_loads, b64decode
 from funq.models import Action, Widget
 from funq.errors import FunqError, TimeOutError
 
@@ -80,6 +79,10 @@ class FunqClient():
                             " instance of HooqAliases")
 
         self.aliases = aliases
+        # number of commands sent, allows to know if some cached data
+        # may be outdated.
+        self.commands_count = 0
+        self._commands = None
 
         def connect():
             """ try to connect """
@@ -127,12 +130,13 @@ class FunqClient():
         """
         Send a message without waiting for an answer.
         """
-        kwargs['action'] = action
-        rawdata = json.dumps(kwargs).encode('utf-8')
-        header = f'{len(rawdata)}\n'.encode('utf-8')
-        message = header + rawdata
+        self.commands_count += 1
+        rawdata = json_dumps({**kwargs, 'action': action})
         f = self._fsocket
-        f.write(message)
+        # header and data are gathered in the buffer of the socket file,
+        # no intermediate message is built.
+        f.write(b'%d\n' % len(rawdata))
+        f.write(rawdata)
         f.flush()
 
     def send_command(self, action, **kwargs):
@@ -142,7 +146,17 @@ class FunqClient():
 
         :raises: :class:`funq.errors.FunqError` on error
         """
-        self._raw_send(action, kwargs)
+        return self.send_payload(action, kwargs)
+
+    def send_payload(self, action, payload):
+        """
+        Like :meth:`send_command`, but the arguments of the command are
+        given as a dict. The dict is not modified, so the same one can be
+        sent many times, e.g. in loops sending the same command.
+
+        :raises: :class:`funq.errors.FunqError` on error
+        """
+        self._raw_send(action, payload)
         f = self._fsocket
         header = f.readline()
         if not header:
@@ -150,7 +164,7 @@ class FunqClient():
                             "No response from the tested application"
                             " - probably a crash.")
         to_read = int(header)
-        response = json.loads(f.read(to_read).decode('utf-8'))
+        response = json_loads(f.read(to_read))
         if response.get('success') is False:
             raise FunqError(response["errName"], response["errDesc"])
         return response
@@ -300,6 +314,17 @@ class FunqClient():
         """
         return self.send_command('list_commands')
 
+    def has_command(self, name):
+        """
+        Returns True if the libFunq server handles the command `name`.
+
+        The list of available commands is retrieved once, then cached.
+        """
+        if self._commands is None:
+            self._commands = {signature.split('(', 1)[0] for signature
+                              in self._list_commands()['commands']}
+        return name in self._commands
+
     def actions_list(self, with_properties=False):
         """
         Returns a dict with every actions in the application.
@@ -332,7 +357,7 @@ class FunqClient():
         data = self.send_command('grab', format=format_)
         if isinstance(stream, str):
             stream = open(stream, 'wb')
-        raw = base64.standard_b64decode(data['data'])
+        raw = b64decode(data['data'])
         stream.write(raw)
 
     def keyclick(self, text):
@@ -35,10 +35,37 @@
 """
 Definition of widgets and models useable in funq.
 """
-from funq.tools import wait_for
+from funq.tools import wait_for, apply_snooze_factor, b64decode, \
+    b64decode_to, json_dumps
 from funq.errors import FunqError
-import json
-import base64
+import contextlib
+import io
+import os
+import time
+
+# mouse action sent to libFunq for each mouse button
+_MOUSE_ACTIONS = {
+    'left': 'click',
+    'right': 'rightclick',
+    'middle': 'middleclick',
+}
+
+
+# string attributes of tree items that often have the same value
+_SHARED_STRINGS = ('value', 'itempath', 'objectname')
+
+
+@contextlib.contextmanager
+def _as_writable(stream, mode, bufsize=1 << 20):
+    """
+    Yields `stream` if it is a file object, else opens the file named
+    `stream` with a large buffer and closes it when leaving the context.
+    """
+    if not isinstance(stream, str):
+        yield stream
+        return
+    with open(stream, mode, buffering=bufsize) as f:
+        yield f
 
 
 class TreeItem():  # pylint: disable=R0903
@@ -50,15 +77,73 @@ class TreeItem():  # pylint: disable=R0903
         """
         Allow to create a TreeItem from a dico data decoded from json.
         """
-        self.client = client
-
-        for k, v in data.items():
-            setattr(self, k, v)
-        self.items = [self.__class__(client, d) for d in getattr(self, 'items', [])]
+        raw_items = data.get('items', ())
+        attrs = self.__dict__
+        attrs.update(data)
+        attrs['client'] = client
+        attrs['items'] = self._build(client, raw_items)
+
+    @classmethod
+    def _from_raw(cls, client, raw):
+        """
+        Create an item without calling __init__, reusing the dict `raw`
+        decoded from json as the item's __dict__ (so `raw` is modified).
+        The 'items' key is left untouched.
+        """
+        item = cls.__new__(cls)
+        item.__dict__ = raw
+        raw['client'] = client
+        return item
+
+    @classmethod
+    def _build(cls, client, roots, order=None, reuse=False):
+        """
+        Create the list of items (and their subitems) given raw data
+        decoded from json.
+
+        The tree is built with an explicit stack rather than with
+        recursive constructor calls, so deep trees do not pay one python
+        frame per level. Equal strings (values, item paths, object names)
+        and class lists are shared between the items.
+
+        If `order` is a list, every item is appended to it in depth-first
+        order.
+
+        If `reuse` is True, the raw dicts are reused by the items (see
+        :meth:`_from_raw`), else they are left untouched.
+        """
+        strings = {}
+        classes_lists = {}
+        result = []
+        stack = [(result, raw) for raw in reversed(roots)]
+        while stack:
+            parent_list, raw = stack.pop()
+            subitems = raw.get('items')
+            attrs = raw if reuse else dict(raw)
+            item = cls._from_raw(client, attrs)
+            for key in _SHARED_STRINGS:
+                value = attrs.get(key)
+                if value is not None:
+                    attrs[key] = strings.setdefault(value, value)
+            classes = attrs.get('classes')
+            if classes is not None:
+                key = tuple(classes)
+                shared = classes_lists.get(key)
+                if shared is None:
+                    shared = classes_lists[key] = list(classes)
+                attrs['classes'] = shared
+            attrs['items'] = children = []
+            parent_list.append(item)
+            if order is not None:
+                order.append(item)
+            if subitems:
+                stack.extend((children, sub) for sub in reversed(subitems))
+        return result
 
 
 class BaseItems():
     """ Class to handle 'item_class' argument for derived subclasses """
+    __slots__ = ()
 
     def __init_subclass__(cls, /, item_class, **kwargs):
         super().__init_subclass__(**kwargs)
@@ -70,14 +155,31 @@ class TreeItems(BaseItems, item_class=TreeItem):
     Abstract class to manipulate data that contains :class:`TreeItem`. Used
     by modelitems and graphicsitems.
     """
+    __slots__ = ('client', 'items', '_dfs_order')
 
     def __init__(self, client, data):
         """
         Allow to create an instance of the class given some data coming from
         decoded json.
         """
+        self._set_items(client, data['items'], reuse=False)
+
+    @classmethod
+    def _from_response(cls, client, data):
+        """
+        Like the constructor, for a response just decoded from json: its
+        dicts are reused by the items instead of being copied, so `data`
+        is modified.
+        """
+        items = cls.__new__(cls)
+        items._set_items(client, data['items'], reuse=True)
+        return items
+
+    def _set_items(self, client, raw_items, reuse):
         self.client = client
-        self.items = [self._item_class(client, v) for v in data['items']]
+        self._dfs_order = []
+        self.items = self._item_class._build(client, raw_items,
+                                             self._dfs_order, reuse=reuse)
 
     def iter(self):
         """
@@ -101,13 +203,8 @@ class TreeItems(BaseItems, item_class=TreeItem):
           for item in items:
               print(item)
         """
-
-        def __iter(items):
-            for item in items:
-                yield item
-                yield from __iter(item.items)
-
-        yield from __iter(self.items)
+        # the depth-first order is computed once, when the items are built
+        return iter(self._dfs_order)
 
 
 class WidgetMetaClass(type):
@@ -123,12 +220,33 @@ class WidgetMetaClass(type):
         return cls
 
     def __call__(cls, client, data):
-        for cppcls in data.get('classes', []):
-            if cppcls in cls._cpp_classes:
-                if cls is cls._cpp_classes[cppcls]:  # prevent infinite recursion
-                    break
-                return cls._cpp_classes[cppcls](client, data)
-        return super().__call__(client, data)
+        classes = data.get('classes')
+        if classes:
+            cpp_classes = cls._cpp_classes
+            # the most derived class is checked first with a single lookup,
+            # the inheritance chain is only scanned on a miss.
+            target = cpp_classes.get(classes[0])
+            if target is None:
+                for cppcls in classes:
+                    target = cpp_classes.get(cppcls)
+                    if target is not None:
+                        break
+            if target is not None:
+                cls = target
+        return super(WidgetMetaClass, cls).__call__(client, data)
+
+
+class _LazyProperties():
+    """
+    Descriptor that creates the :class:`Object.Properties` of an object on
+    first access, then stores it in the object.
+    """
+
+    def __get__(self, obj, owner):
+        if obj is None:
+            return self
+        properties = obj.__dict__['properties'] = owner.Properties(obj)
+        return properties
 
 
 class Object(metaclass=WidgetMetaClass):
@@ -149,19 +267,48 @@ class Object(metaclass=WidgetMetaClass):
     path = None
 
     class Properties():
+        __slots__ = ('_obj', '_cache')
+
+        #: delay (in seconds) during which the fetched properties are reused,
+        #: as long as no other command is sent by the client.
+        ttl = 0.05
+
         def __init__(self, obj):
-            super().__setattr__(f'_{self.__class__.__name__}__obj', obj)
+            super().__setattr__('_obj', obj)
+            self.invalidate()
+
+        def invalidate(self):
+            """
+            Forget the cached properties; they will be fetched again on next
+            access.
+            """
+            super().__setattr__('_cache', None)
 
-        def __call__(self):
+        def __call__(self, fresh=False):
             """
             Returns a dict of availables properties for this object with associated
             values.
 
+            Properties fetched less than :attr:`ttl` seconds ago are reused,
+            unless another command has been sent in between or `fresh` is
+            True.
+
             Example::
 
               enabled = object.properties()["enabled"]
             """
-            return self.__obj.client.send_command('object_properties', oid=self.__obj.oid)
+            client = self._obj.client
+            if not fresh and self._cache is not None:
+                timestamp, commands_count, properties = self._cache
+                if commands_count == client.commands_count and \
+                        time.monotonic() - timestamp < self.ttl:
+                    return properties
+            properties = client.send_command('object_properties',
+                                             oid=self._obj.oid)
+            super().__setattr__('_cache', (time.monotonic(),
+                                           client.commands_count,
+                                           properties))
+            return properties
 
         def __contains__(self, item):
             return item in self()
@@ -184,7 +331,7 @@ class Object(metaclass=WidgetMetaClass):
 
               object.property['text'] = "My beautiful text"
             """
-            self.__obj.set_properties(**{item: value})
+            self._obj.set_properties(**{item: value})
 
         def __getattr__(self, item):
             """
@@ -204,17 +351,26 @@ class Object(metaclass=WidgetMetaClass):
 
               object.property.text = "My beautiful text"
             """
-            self.__obj.set_properties(**{item: value})
+            self._obj.set_properties(**{item: value})
+
+    # the Properties instance is only created when first used.
+    properties = _LazyProperties()
 
     def __init__(self, client, data):
         """
         Allow to create an Object or a subclass given data coming from
         decoded json.
         """
-        for k, v in data.items():
-            setattr(self, k, v)
-        self.client = client
-        self.property = self.properties = self.Properties(self)
+        attrs = self.__dict__
+        attrs.update(data)
+        attrs['client'] = client
+
+    def __getattr__(self, name):
+        # `property` is an alias of `properties`
+        if name == 'property':
+            return self.properties
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'")
 
     def set_properties(self, **properties):
         """
@@ -224,6 +380,9 @@ class Object(metaclass=WidgetMetaClass):
 
           object.set_properties(text="My beautiful text")
         """
+        properties_cache = self.__dict__.get('properties')
+        if properties_cache is not None:
+            properties_cache.invalidate()
         self.client.send_command('object_set_properties',
                                  oid=self.oid,
                                  properties=properties)
@@ -238,6 +397,21 @@ class Object(metaclass=WidgetMetaClass):
         """
         self.set_properties(**{name: value})
 
+    def get_property(self, name):
+        """
+        Returns the value of one property of this object. Only this value
+        is sent back by the application when it supports it, else every
+        property is fetched.
+
+        Example::
+
+          text = object.get_property('text')
+        """
+        if self.client.has_command('object_property'):
+            return self.client.send_command('object_property', oid=self.oid,
+                                            name=name)['value']
+        return self.properties()[name]
+
     def wait_for_properties(self, props, timeout=10.0, timeout_interval=0.1):
         """
         Wait for the properties to have the given values.
@@ -246,6 +420,23 @@ class Object(metaclass=WidgetMetaClass):
 
           self.wait_for_properties({'enabled': True, 'visible': True})
         """
+        if self.client.has_command('wait_for_properties'):
+            # let libFunq check the properties, each call blocks on the
+            # server side for at most one second.
+            server_timeout = min(apply_snooze_factor(timeout), 1.0)
+            send_command = self.client.send_command
+            oid = self.oid
+
+            def check_props():
+                return send_command(
+                    'wait_for_properties',
+                    oid=oid,
+                    props=props,
+                    timeout=server_timeout,
+                    interval=timeout_interval,
+                )['result']
+            return wait_for(check_props, timeout, 0)
+
         def check_props():
             properties = self.properties()
             for k, v in props.items():
@@ -308,7 +499,22 @@ class AbstractItemModel(Object):
         model.
         """
         data = self.client.send_command('model_items', oid=self.oid)
-        return ModelItems(self.client, data)
+        return ModelItems._from_response(self.client, data)
+
+    def find_row(self, column, value):
+        """
+        Returns the row of the first top-level item of this model in the
+        given column whose value is `value`, or -1 if there is none.
+
+        Only the row is sent back by the application when it supports it,
+        else every item of the model is fetched.
+        """
+        if self.client.has_command('model_find_row'):
+            return self.client.send_command('model_find_row', oid=self.oid,
+                                            column=column,
+                                            value=value)['row']
+        return next((item.row for item in self.items().items
+                     if item.column == column and item.value == value), -1)
 
 
 class Widget(Object):
@@ -330,18 +536,38 @@ class Widget(Object):
         if wait_for_enabled > 0.0:
             self.wait_for_properties({'enabled': True, 'visible': True},
                                      timeout=wait_for_enabled)
-        if btn == 'left':
-            action = 'click'
-        elif btn == 'right':
-            action = 'rightclick'
-        elif btn == 'middle':
-            action = 'middleclick'
-        else:
+        action = _MOUSE_ACTIONS.get(btn)
+        if action is None:
             raise ValueError(f'Invalid mouse button: {btn}')
         self.client.send_command('widget_click',
                                  oid=self.oid,
                                  mouseAction=action)
 
+    def make_clicker(self, btn='left', wait_for_enabled=10.0):
+        """
+        Returns a callable without arguments that clicks on the widget, like
+        :meth:`click` with the same parameters. The mouse button is resolved
+        only once, which is useful to click many times on a widget.
+
+        Example::
+
+          click = widget.make_clicker(btn='right')
+          for i in range(100):
+              click()
+        """
+        action = _MOUSE_ACTIONS.get(btn)
+        if action is None:
+            raise ValueError(f'Invalid mouse button: {btn}')
+        send_payload = self.client.send_payload
+        payload = {'oid': self.oid, 'mouseAction': action}
+
+        def click():
+            if wait_for_enabled > 0.0:
+                self.wait_for_properties({'enabled': True, 'visible': True},
+                                         timeout=wait_for_enabled)
+            send_payload('widget_click', payload)
+        return click
+
     def dclick(self, wait_for_enabled=10.0):
         """
         Double click on the widget. If wait_for_enabled is > 0 (default), it
@@ -440,7 +666,7 @@ class Widget(Object):
         :return: The image as a binary blob in the given format.
         """
         data = self.client.send_command('grab', format=format_, oid=self.oid)
-        return base64.standard_b64decode(data['data'])
+        return b64decode(data['data'])
 
     def map_position_from(self, x, y, parent):
         """
@@ -499,6 +725,42 @@ class Widget(Object):
                                         recursive=recursive)
 
 
+def _subitems_by_value(item, column):
+    """
+    Returns a dict {value: [subitems]} of the direct subitems of `item` that
+    are in the given column.
+
+    The dict is computed once per column and kept on `item`, so successive
+    lookups (:meth:`ModelItems.row_by_named_path`) are dict accesses instead
+    of a scan of every subitem.
+    """
+    cache = getattr(item, '_subitems_by_value', None)
+    if cache is None:
+        cache = item._subitems_by_value = {}
+    index = cache.get(column)
+    if index is None:
+        index = cache[column] = {}
+        for subitem in item.items:
+            if subitem.column == column:
+                index.setdefault(subitem.value, []).append(subitem)
+    return index
+
+
+def _subitems_by_row(item):
+    """
+    Returns a dict {row: [subitems sorted by column]} of the direct subitems
+    of `item`, computed once and kept on `item`.
+    """
+    index = getattr(item, '_subitems_by_row', None)
+    if index is None:
+        index = item._subitems_by_row = {}
+        for subitem in item.items:
+            index.setdefault(subitem.row, []).append(subitem)
+        for row in index.values():
+            row.sort(key=lambda it: it.column)
+    return index
+
+
 class ModelItem(TreeItem):
     """
     Allow to manipulate a modelitem in a QAbstractItemModel or derived.
@@ -533,6 +795,8 @@ class ModelItems(TreeItems, item_class=ModelItem):
 
     :var items: list of :class:`ModelItem`
     """
+    # lookup tables of row_by_named_path for the top-level items
+    __slots__ = ('_subitems_by_value', '_subitems_by_row')
 
     def item_by_named_path(self, named_path, match_column=0, sep='/',
                            column=0):
@@ -579,19 +843,15 @@ class ModelItems(TreeItems, item_class=ModelItem):
         else:
             parts = named_path.split(sep)
         item = self
-        while item and parts:
-            next_item = None
-            part = parts.pop(0)
-            for item_ in item.items:
-                if match_column == item_.column and item_.value == part:
-                    # we found the item
-                    # if it is the last part name, just return the columns
-                    if not parts:
-                        row = [it for it in item.items
-                               if it.row == item_.row]
-                        return sorted(row, key=lambda it: it.column)
-                    next_item = item_
-            item = next_item
+        last = len(parts) - 1
+        for i, part in enumerate(parts):
+            matches = _subitems_by_value(item, match_column).get(part)
+            if not matches:
+                return None
+            if i == last:
+                # we found the item, just return the columns of its row
+                return list(_subitems_by_row(item)[matches[0].row])
+            item = matches[-1]
         return None
 
 
@@ -622,6 +882,37 @@ class AbstractItemView(Widget, cpp_class='QAbstractItemView'):
                                  offset_y=offset_y,
                                  itempath=item.itempath)
 
+    def batch_item_action(self, items, itemaction, origin=None,
+                          offset_x=None, offset_y=None):
+        """
+        Apply the same action on every given item, in one round trip when
+        the application supports it. Stops at the first item that can not
+        be found.
+
+        Example::
+
+          view.batch_item_action(view.model().items(), "select")
+
+        :param items: an iterable of :class:`ModelItem`.
+        :param itemaction: the action to apply, e.g. "select", "edit",
+                           "click", "rightclick", "middleclick" or
+                           "doubleclick".
+        """
+        if not self.client.has_command('model_item_actions'):
+            for item in items:
+                self._item_action(item, itemaction, origin=origin,
+                                  offset_x=offset_x, offset_y=offset_y)
+            return
+        self.client.send_command(
+            'model_item_actions',
+            oid=self.oid,
+            itemaction=itemaction,
+            origin=origin,
+            offset_x=offset_x,
+            offset_y=offset_y,
+            items=[{'row': item.row, 'column': item.column,
+                    'itempath': item.itempath} for item in items])
+
     def select_item(self, item):
         """
         Select the specified item.
@@ -656,18 +947,44 @@ class AbstractItemView(Widget, cpp_class='QAbstractItemView'):
         :param btn: The mouse button to click.
                     Available values: "left", "middle" or "right".
         """
-        if btn == "left":
-            action = "click"
-        elif btn == "right":
-            action = "rightclick"
-        elif btn == "middle":
-            action = "middleclick"
-        else:
+        action = _MOUSE_ACTIONS.get(btn)
+        if action is None:
             raise ValueError(f"Invalid mouse button: {btn}")
         self._item_action(
             item, action, origin=origin, offset_x=offset_x, offset_y=offset_y
         )
 
+    def make_item_clicker(self, btn="left", origin="center"):
+        """
+        Returns a callable `click(item, offset_x=0, offset_y=0)` that clicks
+        on items of this view, like :meth:`click_item` with the same `btn`
+        and `origin`. The mouse button is resolved only once, which is
+        useful to click on many items.
+
+        Example::
+
+          click = view.make_item_clicker('left')
+          for item in view.model().items():
+              click(item)
+        """
+        action = _MOUSE_ACTIONS.get(btn)
+        if action is None:
+            raise ValueError(f"Invalid mouse button: {btn}")
+        send_payload = self.client.send_payload
+        oid = self.oid
+
+        def click(item, offset_x=0, offset_y=0):
+            send_payload('model_item_action', {
+                'oid': oid,
+                'itemaction': action,
+                'row': item.row, 'column': item.column,
+                'origin': origin,
+                'offset_x': offset_x,
+                'offset_y': offset_y,
+                'itempath': item.itempath,
+            })
+        return click
+
     def dclick_item(self, item, origin="center", offset_x=0, offset_y=0):
         """
         Double click on the specified item.
@@ -686,7 +1003,8 @@ class AbstractItemView(Widget, cpp_class='QAbstractItemView'):
             offset_y=offset_y
         )
 
-    def current_editor(self, editor_class_name=None):
+    def current_editor(self, editor_class_name=None, timeout=10.0,
+                       timeout_interval=0.1):
         """
         Returns the editor actually opened on this view. One item must be
         in editing mode, by using :meth:`ModelItem.dclick` or
@@ -697,17 +1015,43 @@ class AbstractItemView(Widget, cpp_class='QAbstractItemView'):
 
         :param editor_class_name: name of the editor type. If None, every
                                   type of editor will be tested (this may
-                                  actually be very slow)
-        """
-        qt_path = '::qt_scrollarea_viewport::'
+                                  actually be very slow if the libFunq
+                                  server does not know the 'find_editor'
+                                  command)
+        :param timeout: if > 0, tries to get the editor until timeout
+                        is reached (second)
+        :param timeout_interval: time between two atempts to get the editor
+                                 (seconds)
+        """
+        prefix = self.path + '::qt_scrollarea_viewport::'
         if editor_class_name:
-            return self.client.widget(path=self.path
-                                      + qt_path + editor_class_name)
+            return self.client.widget(path=prefix + editor_class_name,
+                                      timeout=timeout,
+                                      timeout_interval=timeout_interval)
+
+        if self.client.has_command('find_editor'):
+            send_command = self.client.send_command
+
+            def get_editor():
+                """ Try to get the editor """
+                try:
+                    return True, send_command(
+                        'find_editor', oid=self.oid,
+                        classes=self.editor_class_names)
+                except FunqError as err:
+                    if err.classname != 'MissingEditor':
+                        raise
+                    return err
+            editor = Widget(self.client,
+                            wait_for(get_editor, timeout, timeout_interval))
+            editor.wait_for_properties({'enabled': True, 'visible': True})
+            return editor
 
         for editor_class_name in self.editor_class_names:
             try:
-                return self.client.widget(path=self.path
-                                          + qt_path + editor_class_name)
+                return self.client.widget(path=prefix + editor_class_name,
+                                          timeout=timeout,
+                                          timeout_interval=timeout_interval)
             except FunqError:
                 pass
 
@@ -778,20 +1122,40 @@ class TreeView(AbstractItemView, cpp_class='QTreeView'):
 class TabBar(Widget, cpp_class="QTabBar"):
     """
     Allow to manipulate a QTabBar Widget.
+
+    :var tab_texts_ttl: delay (seconds) during which the tab texts fetched
+                        by :meth:`set_current_tab` are reused, as long as
+                        no other command is sent by the client.
     """
+    tab_texts_ttl = 0.2
+    _tab_texts_cache = None
 
     def tab_texts(self):
         """
         Returns the list of texts in tabbar.
         """
         data = self.client.send_command('tabbar_list', oid=self.oid)
-        return data["tabtexts"]
+        tabtexts = data["tabtexts"]
+        self._tab_texts_cache = (time.monotonic(), self.client.commands_count,
+                                 tabtexts)
+        return tabtexts
 
     def set_current_tab(self, tab_index_or_name):
         """
         Define the current tab given an index or a tab text.
+
+        The tab texts are fetched at most once every :attr:`tab_texts_ttl`
+        seconds, unless another command has been sent in between; changing
+        the current tab does not modify them.
         """
-        tabnames = self.tab_texts()
+        client = self.client
+        cache = self._tab_texts_cache
+        if cache is not None and cache[1] == client.commands_count and \
+                time.monotonic() - cache[0] < self.tab_texts_ttl:
+            timestamp, _, tabnames = cache
+        else:
+            tabnames = self.tab_texts()
+            timestamp = self._tab_texts_cache[0]
         if isinstance(tab_index_or_name, int):
             index = tab_index_or_name
             if index < 0 or index >= len(tabnames):
@@ -799,6 +1163,7 @@ class TabBar(Widget, cpp_class="QTabBar"):
         else:
             index = tabnames.index(tab_index_or_name)
         self.set_property('currentIndex', index)
+        self._tab_texts_cache = (timestamp, client.commands_count, tabnames)
 
 
 class GItem(TreeItem):
@@ -843,13 +1208,8 @@ class GItem(TreeItem):
         """
         Click on this gitem.
         """
-        if btn == "left":
-            action = "click"
-        elif btn == "right":
-            action = "rightclick"
-        elif btn == "middle":
-            action = "middleclick"
-        else:
+        action = _MOUSE_ACTIONS.get(btn)
+        if action is None:
             raise ValueError(f"Invalid mouse button: {btn}")
         self._action(action)
 
@@ -868,6 +1228,7 @@ class GItems(TreeItems, item_class=GItem):
     :var items: list of :class:`GItem` that are on top of the scene
                 (and not subitems)
     """
+    __slots__ = ()
 
 
 class GraphicsView(Widget, cpp_class='QGraphicsView'):
@@ -881,17 +1242,21 @@ class GraphicsView(Widget, cpp_class='QGraphicsView'):
         of this QGraphicsView.
         """
         data = self.client.send_command('graphicsitems', oid=self.oid)
-        return GItems(self.client, data)
+        return GItems._from_response(self.client, data)
 
-    def dump_gitems(self, stream='gitems.json'):
+    def dump_gitems(self, stream='gitems.json', pretty=False):
         """
         Write in a file the list of graphics items.
+
+        :param pretty: if True, the json is indented and its keys are
+                       sorted, else it is written in compact form.
         """
         data = self.client.send_command('graphicsitems', oid=self.oid)
-        if isinstance(stream, str):
-            stream = open(stream, 'w')
-        json.dump(data,
-                  stream, sort_keys=True, indent=4, separators=(',', ': '))
+        raw = json_dumps(data, pretty=pretty)
+        with _as_writable(stream, 'wb') as f:
+            if isinstance(f, io.TextIOBase):
+                raw = raw.decode('utf-8')
+            f.write(raw)
 
     def grab_scene(self, stream, format_="PNG"):
         """
@@ -902,14 +1267,25 @@ class GraphicsView(Widget, cpp_class='QGraphicsView'):
         """
         data = self.client.send_command('grab_graphics_view', format=format_,
                                         oid=self.oid)
-        has_to_be_closed = False
-        if isinstance(stream, str):
-            stream = open(stream, 'wb')
-            has_to_be_closed = True
-        raw = base64.standard_b64decode(data['data'])
-        stream.write(raw)
-        if has_to_be_closed:
-            stream.close()
+        with _as_writable(stream, 'wb') as f:
+            b64decode_to(data['data'], f)
+
+    def grab_scene_to_file(self, path, format_="PNG"):
+        """
+        Save the full QGraphicsScene content under the GraphicsView as an
+        image file, written directly by the tested application so the image
+        does not go through the libFunq connection.
+
+        `path` must be reachable by the tested application (usually the
+        same machine). Applications that do not support it fall back to
+        :meth:`grab_scene`.
+        """
+        if not self.client.has_command('grab_graphics_view_to_file'):
+            self.grab_scene(path, format_=format_)
+            return
+        self.client.send_command('grab_graphics_view_to_file',
+                                 format=format_, oid=self.oid,
+                                 path=os.path.abspath(path))
 
 
 class ComboBox(Widget, cpp_class='QComboBox'):
@@ -932,12 +1308,12 @@ class ComboBox(Widget, cpp_class='QComboBox'):
         if not isinstance(text, str):
             raise TypeError('the text parameter must be a string'
                             f' - got {type(text)}')
-        column = self.properties()['modelColumn']
-        index = -1
-        for item in self.model().items():
-            if column == item.column and item.value == text:
-                index = item.row
-                break
+        if self.client.has_command('combobox_find_text'):
+            index = self.client.send_command('combobox_find_text',
+                                             oid=self.oid, text=text)['row']
+        else:
+            column = self.get_property('modelColumn')
+            index = self.model().find_row(column, text)
         assert index > -1, (f"The text `{text}` is not in the combobox `{self.path}`")
         self.set_property('currentIndex', index)
 
@@ -945,23 +1321,46 @@ class ComboBox(Widget, cpp_class='QComboBox'):
 class HeaderView(Widget, cpp_class='QHeaderView'):
     """
     Allow to manipulate a QHeaderView.
+
+    :var header_texts_ttl: delay (seconds) during which the header texts
+                           fetched by :meth:`header_texts` are reused by
+                           :meth:`header_click`, as long as no other
+                           command is sent by the client.
     """
+    header_texts_ttl = 0.2
+    _header_texts_cache = None
 
     def header_texts(self):
         """
         Returns the list of texts in the headerview.
         """
         data = self.client.send_command('headerview_list', oid=self.oid)
-        return data["headertexts"]
+        headertexts = data["headertexts"]
+        self._header_texts_cache = (time.monotonic(),
+                                    self.client.commands_count, headertexts)
+        return headertexts
 
     def header_click(self, index_or_name):
         """
         Click on the given header, identified by a visual index or
         a displayed name.
+
+        A name is looked up in the header texts just returned by
+        :meth:`header_texts` if any, else by the tested application.
         """
+        kwargs = {}
+        cache = self._header_texts_cache
+        if isinstance(index_or_name, str) and cache is not None and \
+                cache[1] == self.client.commands_count and \
+                time.monotonic() - cache[0] < self.header_texts_ttl:
+            try:
+                kwargs['logicalIndex'] = cache[2].index(index_or_name)
+            except ValueError:
+                pass
         return self.client.send_command('headerview_click',
                                         oid=self.oid,
-                                        indexOrName=index_or_name)
+                                        indexOrName=index_or_name,
+                                        **kwargs)
 
 
 class QuickItem(Object, cpp_class="QQuickItem"):
@@ -994,6 +1393,30 @@ class QuickWindow(Widget, cpp_class="QQuickWindow"):
       quick_window = self.funq.active_widget()
     """
 
+    def __init__(self, client, data):
+        super().__init__(client, data)
+        # aliases of the items start with the path of the window
+        self._path_prefix = self.path + '::'
+        self._path_prefix_len = len(self._path_prefix)
+        self._alias_paths = {}
+
+    def _alias_path(self, alias):
+        """
+        Returns the path of an item alias, relative to this window. Paths
+        are computed once per alias.
+        """
+        relative_path = self._alias_paths.get(alias)
+        if relative_path is None:
+            path = self.client.aliases[alias]
+            if not path.startswith(self._path_prefix):
+                raise TypeError(
+                    f"alias {path} does not belong to this quick window")
+            # remove the window path here, c++ code only requires the
+            # object path from the root item.
+            relative_path = self._alias_paths[alias] = \
+                path[self._path_prefix_len:]
+        return relative_path
+
     def item(self, alias=None, path=None, id=None):
         """
         Search for a :class:`funq.models.QuickItem` and returns it.
@@ -1045,12 +1468,7 @@ class QuickWindow(Widget, cpp_class="QQuickWindow"):
             raise TypeError("alias, path or id must be defined")
 
         if alias and not id:
-            path = self.client.aliases[alias]
-            if not path.startswith(self.path):
-                raise TypeError(f"alias {path} does not belong to this quick window")
-            # remove the window path here, c++ code only requires the
-            # object path from the root item.
-            path = path[len(self.path) + 2:]
+            path = self._alias_path(alias)
 
         data = self.client.send_command(
             'quick_item_find',
@@ -1059,3 +1477,30 @@ class QuickWindow(Widget, cpp_class="QQuickWindow"):
             qid=id,
         )
         return Object(self.client, data)
+
+    def items(self, aliases=(), paths=(), ids=()):
+        """
+        Search for several :class:`funq.models.QuickItem` in one round trip
+        and returns them in a list: first the items for the `aliases`, then
+        for the `paths` and finally for the `ids`.
+
+        Example::
+
+          rect, root = quick_window.items(aliases=['my_rect'], ids=['root'])
+
+        See :meth:`item` for the meaning of the parameters, which are lists
+        here.
+        """
+        queries = [{'path': self._alias_path(alias), 'qid': None}
+                   for alias in aliases]
+        queries.extend({'path': path, 'qid': None} for path in paths)
+        queries.extend({'path': None, 'qid': id_} for id_ in ids)
+        client = self.client
+        if not client.has_command('quick_item_find_batch'):
+            return [Object(client, client.send_command(
+                'quick_item_find', quick_window_oid=self.oid, **query))
+                for query in queries]
+        data = client.send_command('quick_item_find_batch',
+                                   quick_window_oid=self.oid,
+                                   queries=queries)
+        return [Object(client, item) for item in data['items']]
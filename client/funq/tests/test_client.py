@@ -34,6 +34,7 @@
 
 from nose.tools import assert_equals, raises
 from funq import client
+import io
 import os
 import subprocess
 
@@ -190,3 +191,19 @@ class TestApplicationContext:
         ctx = client.ApplicationContext(
             appconf, client_class=lambda *a, **kwa: None)
         assert_equals(ctx._process.command, ['funq', 'valgrind', 'command'])
+
+
+class TestFunqClientSend:
+
+    def test_payload_not_modified(self):
+        funq = client.FunqClient.__new__(client.FunqClient)
+        funq.commands_count = 0
+        funq._socket = funq._fsocket = io.BytesIO()
+        payload = {'oid': 1}
+        funq._raw_send('widget_click', payload)
+        funq._raw_send('widget_click', payload)
+        assert_equals(payload, {'oid': 1})
+        assert_equals(funq.commands_count, 2)
+        data = funq._fsocket.getvalue().split(b'\n')
+        assert_equals(data[1][:int(data[0])],
+                      b'{"oid":1,"action":"widget_click"}')
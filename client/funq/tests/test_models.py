@@ -32,8 +32,11 @@
 # The fact that you are presently reading this means that you have had
 # knowledge of the CeCILL v2.1 license and that you accept its terms.
 
-from nose.tools import assert_is_instance, assert_equals
-from funq import models
+from nose.tools import assert_is_instance, assert_equals, assert_true, raises
+from funq import models, tools
+import io
+import os
+import tempfile
 
 
 class TestWidgetInheritance:
@@ -128,3 +131,460 @@ class TestModelItems:
     def test_item_by_named_path_missing(self):
         item = self.model_items.item_by_named_path('blah/bluh')
         assert_equals(item, None)
+
+
+class TestTreeItems:
+
+    def test_iter_order(self):
+        data = {'items': [
+            dict(value='a', items=[
+                dict(value='a1', items=[dict(value='a11')]),
+                dict(value='a2'),
+            ]),
+            dict(value='b'),
+        ]}
+        items = models.TreeItems(None, data)
+        assert_equals([it.value for it in items],
+                      ['a', 'a1', 'a11', 'a2', 'b'])
+
+    def test_from_raw(self):
+        raw = {'value': 'a'}
+        item = models.ModelItem._from_raw(None, raw)
+        assert_true(vars(item) is raw)
+        assert_equals((item.value, item.client, item.itempath),
+                      ('a', None, None))
+
+    def test_data_not_modified(self):
+        data = {'items': [dict(value='a', items=[dict(value='a1')])]}
+        first = models.ModelItems(None, data)
+        second = models.ModelItems(None, data)
+        assert_equals(data, {'items': [dict(value='a',
+                                            items=[dict(value='a1')])]})
+        assert_equals([it.value for it in second],
+                      [it.value for it in first])
+
+    def test_from_response(self):
+        data = {'items': [dict(value='a')]}
+        items = models.ModelItems._from_response(None, data)
+        assert_true(vars(items.items[0]) is data['items'][0])
+
+    def test_slots(self):
+        items = models.GItems(None, {'items': []})
+        assert_true(not hasattr(items, '__dict__'))
+
+    def test_deep_tree(self):
+        root = node = {'value': 'root'}
+        for i in range(5000):
+            node['items'] = [{'value': str(i)}]
+            node = node['items'][0]
+        items = models.ModelItems(None, {'items': [root]})
+        assert_equals(len(list(items)), 5001)
+        assert_is_instance(items.items[0].items[0], models.ModelItem)
+
+
+class TestRowByNamedPath:
+
+    def setup(self):
+        data = {'items': [
+            dict(row=0, column=0, value='a', items=[
+                dict(row=0, column=0, value='x'),
+                dict(row=0, column=1, value='x1'),
+                dict(row=1, column=0, value='y'),
+                dict(row=1, column=1, value='y1'),
+            ]),
+            dict(row=0, column=1, value='b'),
+        ]}
+        self.model_items = models.ModelItems(None, data)
+
+    def test_row(self):
+        items = self.model_items.row_by_named_path('a/y')
+        assert_equals([it.value for it in items], ['y', 'y1'])
+
+    def test_match_column(self):
+        items = self.model_items.row_by_named_path(['b'], match_column=1)
+        assert_equals([it.value for it in items], ['a', 'b'])
+
+    def test_missing(self):
+        assert_equals(self.model_items.row_by_named_path('a/z'), None)
+        assert_equals(self.model_items.row_by_named_path('b/x'), None)
+
+
+class FakeClient:
+
+    def __init__(self, available_commands=(), **answers):
+        self.available_commands = available_commands
+        self.answers = answers
+        self.commands = []
+        self.commands_count = 0
+
+    def has_command(self, name):
+        return name in self.available_commands
+
+    def send_command(self, action, **kwargs):
+        self.commands_count += 1
+        self.commands.append((action, kwargs))
+        return self.answers.get(action, {})
+
+    def send_payload(self, action, payload):
+        return self.send_command(action, **payload)
+
+
+class TestObjectProperties:
+
+    def setup(self):
+        self.client = FakeClient(object_properties={'text': 'a', 'x': 1})
+        self.obj = models.Object(self.client, {'oid': 1})
+
+    def nb_fetch(self):
+        return [c[0] for c in self.client.commands].count('object_properties')
+
+    def test_cached(self):
+        assert_equals(self.obj.property.text, 'a')
+        assert_equals(self.obj.property['x'], 1)
+        assert_equals(self.nb_fetch(), 1)
+
+    def test_lazy(self):
+        assert_true('properties' not in vars(self.obj))
+        assert_true(self.obj.property is self.obj.properties)
+        assert_equals(self.client.commands, [])
+
+    @raises(AttributeError)
+    def test_missing_attribute(self):
+        self.obj.text
+
+    def test_get_property(self):
+        assert_equals(self.obj.get_property('x'), 1)
+        self.client.available_commands = ('object_property',)
+        self.client.answers['object_property'] = {'value': 'b'}
+        assert_equals(self.obj.get_property('text'), 'b')
+        assert_equals(self.client.commands[-1],
+                      ('object_property', {'oid': 1, 'name': 'text'}))
+
+    def test_fresh(self):
+        self.obj.properties()
+        self.obj.properties(fresh=True)
+        assert_equals(self.nb_fetch(), 2)
+
+    def test_invalidated_by_commands(self):
+        self.obj.properties()
+        self.obj.set_property('text', 'b')
+        self.obj.properties()
+        assert_equals(self.nb_fetch(), 2)
+
+    def test_wait_for_properties(self):
+        self.obj.wait_for_properties({'text': 'a'})
+        assert_equals(self.nb_fetch(), 1)
+
+    def test_wait_for_properties_on_server(self):
+        self.client.available_commands = ('wait_for_properties',)
+        self.client.answers['wait_for_properties'] = {'result': True}
+        self.obj.wait_for_properties({'text': 'a'}, timeout=5.0)
+        action, kwargs = self.client.commands[-1]
+        assert_equals(action, 'wait_for_properties')
+        assert_equals(kwargs['props'], {'text': 'a'})
+        assert_equals(kwargs['timeout'], 1.0)
+
+
+class TestWidgetMetaClass:
+
+    def test_most_derived_class(self):
+        widget = models.Widget(FakeClient(), {'classes': ['QTableView']})
+        assert_is_instance(widget, models.TableView)
+
+    def test_inheritance_chain(self):
+        widget = models.Widget(
+            FakeClient(), {'classes': ['NotDefined', 'QComboBox', 'QWidget']})
+        assert_is_instance(widget, models.ComboBox)
+
+    def test_not_registered(self):
+        widget = models.Widget(FakeClient(), {'classes': ['NotDefined']})
+        assert_equals(type(widget), models.Widget)
+
+
+class TestWidgetClick:
+
+    def test_click_buttons(self):
+        client = FakeClient()
+        widget = models.Widget(client, {'oid': 1})
+        for btn, action in (('left', 'click'), ('right', 'rightclick'),
+                            ('middle', 'middleclick')):
+            widget.click(wait_for_enabled=0, btn=btn)
+            assert_equals(client.commands[-1],
+                          ('widget_click', {'oid': 1, 'mouseAction': action}))
+
+    def test_make_clicker(self):
+        client = FakeClient()
+        click = models.Widget(client, {'oid': 1}).make_clicker(
+            btn='middle', wait_for_enabled=0)
+        click()
+        click()
+        assert_equals(client.commands, [
+            ('widget_click', {'oid': 1, 'mouseAction': 'middleclick'})] * 2)
+
+    def test_make_item_clicker(self):
+        client = FakeClient()
+        view = models.Widget(client, {'oid': 1,
+                                      'classes': ['QAbstractItemView']})
+        item = models.ModelItem(client, {'row': 2, 'column': 1})
+        view.make_item_clicker('right')(item, offset_x=3)
+        action, kwargs = client.commands[-1]
+        assert_equals(action, 'model_item_action')
+        assert_equals(
+            (kwargs['itemaction'], kwargs['row'], kwargs['offset_x']),
+            ('rightclick', 2, 3))
+
+    def test_batch_item_action(self):
+        client = FakeClient(available_commands=('model_item_actions',))
+        view = models.Widget(client, {'oid': 1,
+                                      'classes': ['QAbstractItemView']})
+        items = [models.ModelItem(client, {'row': row, 'column': 0})
+                 for row in range(3)]
+        view.batch_item_action(items, 'select')
+        assert_equals(len(client.commands), 1)
+        action, kwargs = client.commands[0]
+        assert_equals(action, 'model_item_actions')
+        assert_equals([item['row'] for item in kwargs['items']], [0, 1, 2])
+
+    def test_batch_item_action_fallback(self):
+        client = FakeClient()
+        view = models.Widget(client, {'oid': 1,
+                                      'classes': ['QAbstractItemView']})
+        items = [models.ModelItem(client, {'row': row, 'column': 0})
+                 for row in range(3)]
+        view.batch_item_action(items, 'select')
+        assert_equals([c[0] for c in client.commands],
+                      ['model_item_action'] * 3)
+
+    @raises(ValueError)
+    def test_click_invalid_button(self):
+        widget = models.Widget(FakeClient(), {'oid': 1})
+        widget.click(wait_for_enabled=0, btn='other')
+
+
+class TestGItems:
+
+    def test_shared_classes(self):
+        data = {'items': [
+            dict(gid=1, classes=['QGraphicsObject'], objectname='a'),
+            dict(gid=2, classes=['QGraphicsObject'], objectname='a'),
+        ]}
+        first, second = models.GItems(None, data).items
+        assert_equals(first.classes, ['QGraphicsObject'])
+        assert_true(first.classes is second.classes)
+        assert_true(first.objectname is second.objectname)
+
+    def test_click(self):
+        client = FakeClient()
+        gitem = models.GItem(client, {'gid': 2, 'viewid': 1})
+        gitem.click(btn='right')
+        assert_equals(client.commands, [
+            ('model_gitem_action', {'oid': 1, 'itemaction': 'rightclick',
+                                    'gid': 2})])
+
+    @raises(ValueError)
+    def test_click_invalid_button(self):
+        models.GItem(FakeClient(), {'gid': 2, 'viewid': 1}).click(btn='x')
+
+
+class TestTabBar:
+
+    def setup(self):
+        self.client = FakeClient(tabbar_list={'tabtexts': ['a', 'b']})
+        self.tabbar = models.Widget(self.client, {'oid': 1,
+                                                  'classes': ['QTabBar']})
+
+    def test_set_current_tab(self):
+        self.tabbar.set_current_tab('b')
+        self.tabbar.set_current_tab(0)
+        assert_equals(self.client.commands, [
+            ('tabbar_list', {'oid': 1}),
+            ('object_set_properties', {'oid': 1,
+                                       'properties': {'currentIndex': 1}}),
+            ('object_set_properties', {'oid': 1,
+                                       'properties': {'currentIndex': 0}}),
+        ])
+
+    @raises(ValueError)
+    def test_set_current_tab_invalid_index(self):
+        self.tabbar.set_current_tab(2)
+
+    def test_set_current_tab_after_other_command(self):
+        self.tabbar.set_current_tab('a')
+        self.client.send_command('widget_click', oid=2)
+        self.client.answers['tabbar_list'] = {'tabtexts': ['a', 'b', 'c']}
+        self.tabbar.set_current_tab('c')
+        self.tabbar.set_current_tab(2)
+        assert_equals([c[0] for c in self.client.commands].count(
+            'tabbar_list'), 2)
+        assert_equals(self.client.commands[-1],
+                      ('object_set_properties',
+                       {'oid': 1, 'properties': {'currentIndex': 2}}))
+
+
+class TestGraphicsView:
+
+    def test_grab_scene(self):
+        client = FakeClient(grab_graphics_view={'data': 'ZnVucQ=='})
+        view = models.Widget(client, {'oid': 1,
+                                      'classes': ['QGraphicsView']})
+        stream = io.BytesIO()
+        view.grab_scene(stream)
+        assert_equals(stream.getvalue(), b'funq')
+
+    def test_grab_scene_to_file(self):
+        client = FakeClient(available_commands=('grab_graphics_view_to_file',))
+        view = models.Widget(client, {'oid': 1,
+                                      'classes': ['QGraphicsView']})
+        view.grab_scene_to_file('scene.png')
+        assert_equals(client.commands, [
+            ('grab_graphics_view_to_file',
+             {'oid': 1, 'format': 'PNG',
+              'path': os.path.abspath('scene.png')})])
+
+    def test_dump_gitems(self):
+        client = FakeClient(graphicsitems={'items': [{'gid': 1}]})
+        view = models.Widget(client, {'oid': 1,
+                                      'classes': ['QGraphicsView']})
+        expected = '{\n  "items": [\n    {\n      "gid": 1\n    }\n  ]\n}'
+        text_stream, binary_stream = io.StringIO(), io.BytesIO()
+        view.dump_gitems(text_stream, pretty=True)
+        view.dump_gitems(binary_stream, pretty=True)
+        assert_equals(text_stream.getvalue(), expected)
+        assert_equals(binary_stream.getvalue(), expected.encode())
+
+    def test_dump_gitems_to_path(self):
+        client = FakeClient(graphicsitems={'items': []})
+        view = models.Widget(client, {'oid': 1,
+                                      'classes': ['QGraphicsView']})
+        orjson = tools.orjson
+        try:
+            # same output with or without orjson installed
+            for backend in (orjson, None):
+                tools.orjson = backend
+                with tempfile.TemporaryDirectory() as tmpdir:
+                    path = os.path.join(tmpdir, 'gitems.json')
+                    view.dump_gitems(path)
+                    with open(path) as f:
+                        assert_equals(f.read(), '{"items":[]}')
+        finally:
+            tools.orjson = orjson
+
+
+class TestComboBox:
+
+    def test_set_current_text(self):
+        client = FakeClient(available_commands=('combobox_find_text',),
+                            combobox_find_text={'row': 2})
+        combo = models.Widget(client, {'oid': 1, 'classes': ['QComboBox']})
+        combo.set_current_text('c')
+        assert_equals(client.commands, [
+            ('combobox_find_text', {'oid': 1, 'text': 'c'}),
+            ('object_set_properties', {'oid': 1,
+                                       'properties': {'currentIndex': 2}}),
+        ])
+
+    def test_set_current_text_find_row(self):
+        client = FakeClient(available_commands=('model_find_row',
+                                                'object_property'),
+                            object_property={'value': 1},
+                            model={'oid': 2},
+                            model_find_row={'row': 3})
+        combo = models.Widget(client, {'oid': 1, 'classes': ['QComboBox']})
+        combo.set_current_text('c')
+        assert_equals(client.commands[-2],
+                      ('model_find_row', {'oid': 2, 'column': 1,
+                                          'value': 'c'}))
+        assert_equals(client.commands[-1],
+                      ('object_set_properties',
+                       {'oid': 1, 'properties': {'currentIndex': 3}}))
+
+    def test_find_row_fallback(self):
+        client = FakeClient(model_items={'items': [
+            {'row': 0, 'column': 0, 'value': 'a'},
+            {'row': 0, 'column': 1, 'value': 'b'},
+            {'row': 1, 'column': 1, 'value': 'c'},
+        ]})
+        model = models.AbstractItemModel(client, {'oid': 2})
+        assert_equals(model.find_row(1, 'c'), 1)
+        assert_equals(model.find_row(0, 'c'), -1)
+
+    @raises(AssertionError)
+    def test_set_current_text_missing(self):
+        client = FakeClient(available_commands=('combobox_find_text',),
+                            combobox_find_text={'row': -1})
+        combo = models.Widget(client, {'oid': 1, 'classes': ['QComboBox'],
+                                       'path': 'combo'})
+        combo.set_current_text('z')
+
+
+class TestQuickWindow:
+
+    def setup(self):
+        self.client = FakeClient(
+            quick_item_find_batch={'items': [{'oid': 2}, {'oid': 3}]})
+        self.client.aliases = {'rect': 'QQuickView::QQuickItem::Rect',
+                               'other': 'QWidget::QQuickItem'}
+        self.window = models.Widget(self.client, {
+            'oid': 1, 'path': 'QQuickView', 'classes': ['QQuickWindow']})
+
+    def test_item_alias(self):
+        self.window.item(alias='rect')
+        assert_equals(self.client.commands, [
+            ('quick_item_find', {'quick_window_oid': 1,
+                                 'path': 'QQuickItem::Rect', 'qid': None})])
+
+    def test_item_alias_cached(self):
+        self.window.item(alias='rect')
+        self.client.aliases = {}
+        self.window.item(alias='rect')
+        assert_equals(self.client.commands[0], self.client.commands[1])
+
+    @raises(TypeError)
+    def test_item_alias_other_window(self):
+        self.window.item(alias='other')
+
+    def test_items(self):
+        self.client.available_commands = ('quick_item_find_batch',)
+        items = self.window.items(aliases=['rect'], ids=['root'])
+        assert_equals([item.oid for item in items], [2, 3])
+        assert_equals(self.client.commands, [
+            ('quick_item_find_batch', {
+                'quick_window_oid': 1,
+                'queries': [{'path': 'QQuickItem::Rect', 'qid': None},
+                            {'path': None, 'qid': 'root'}]})])
+
+    def test_items_fallback(self):
+        self.window.items(paths=['a', 'b'])
+        assert_equals([c[0] for c in self.client.commands],
+                      ['quick_item_find'] * 2)
+
+
+class TestHeaderView:
+
+    def setup(self):
+        self.client = FakeClient(headerview_list={'headertexts': ['a', 'b']})
+        self.header = models.Widget(self.client, {'oid': 1,
+                                                  'classes': ['QHeaderView']})
+
+    def test_header_click_name(self):
+        self.header.header_click('b')
+        assert_equals(self.client.commands[-1],
+                      ('headerview_click', {'oid': 1, 'indexOrName': 'b'}))
+
+    def test_header_click_cached_name(self):
+        self.header.header_texts()
+        self.header.header_click('b')
+        self.header.header_texts()
+        self.header.header_click('c')
+        assert_equals(self.client.commands[1::2], [
+            ('headerview_click', {'oid': 1, 'indexOrName': 'b',
+                                  'logicalIndex': 1}),
+            ('headerview_click', {'oid': 1, 'indexOrName': 'c'}),
+        ])
+
+    def test_header_click_after_other_command(self):
+        self.header.header_texts()
+        self.client.send_command('widget_click', oid=2)
+        self.header.header_click('b')
+        assert_equals(self.client.commands[-1],
+                      ('headerview_click', {'oid': 1, 'indexOrName': 'b'}))
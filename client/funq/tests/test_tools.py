@@ -37,6 +37,8 @@ from funq import tools
 import time
 import sys
 import os
+import io
+import base64
 
 
 def test_wait_for():
@@ -96,3 +98,47 @@ def test_wait_for_some_time_with_snooze_factor():
         return t + 0.05 < time.time()
     assert_true(tools.wait_for(func, 0.025))
     tools.SNOOZE_FACTOR = 1.0
+
+
+def test_json_dumps_loads():
+    data = {'action': 'widget_click', 'oid': 2 ** 63, 'text': 'é'}
+    raw = tools.json_dumps(data)
+    assert_true(isinstance(raw, bytes))
+    assert_equals(data, tools.json_loads(raw))
+
+
+def test_json_dumps_pretty():
+    assert_equals(b'{\n  "a": [\n    1\n  ],\n  "b": "\xc3\xa9"\n}',
+                  tools.json_dumps({'b': '\xe9', 'a': [1]}, pretty=True))
+
+
+def test_json_dumps_same_output_without_orjson():
+    data = {'b': '\xe9', 'a': [1, {'c': None}]}
+    outputs = []
+    orjson = tools.orjson
+    try:
+        for backend in (orjson, None):
+            tools.orjson = backend
+            outputs.append((tools.json_dumps(data),
+                            tools.json_dumps(data, pretty=True)))
+    finally:
+        tools.orjson = orjson
+    assert_equals(outputs[0][0], b'{"b":"\xc3\xa9","a":[1,{"c":null}]}')
+    assert_equals(outputs[0], outputs[1])
+
+
+def test_json_dumps_fallback():
+    # too big for orjson, handled by the standard json module
+    assert_equals(b'[100000000000000000000]', tools.json_dumps([10 ** 20]))
+
+
+def test_b64decode():
+    assert_equals(b'funq', tools.b64decode('ZnVucQ=='))
+    assert_equals(b'funq', tools.b64decode(b'ZnVu\ncQ=='))
+
+
+def test_b64decode_to():
+    data = bytes(range(256)) * 10
+    stream = io.BytesIO()
+    tools.b64decode_to(base64.b64encode(data).decode(), stream, chunk_size=8)
+    assert_equals(data, stream.getvalue())
@@ -39,8 +39,20 @@ Tools for funq.
 import os
 import platform
 import time
+import json
+import binascii
 from funq.errors import TimeOutError
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pybase64
+except ImportError:
+    pybase64 = None
+
 # this allows to specify the global snooze factor
 SNOOZE_FACTOR = 1.0
 
@@ -78,6 +90,77 @@ def wait_for(func, timeout, timeout_interval=0.1):
         time.sleep(timeout_interval)
 
 
+def json_dumps(obj, pretty=False):
+    """
+    Serialize obj to JSON and returns it as utf-8 encoded bytes.
+
+    orjson is used if it is installed, falling back to the standard json
+    module for objects that orjson can not serialize.
+
+    :param pretty: if True, keys are sorted and the output is indented
+                   with two spaces.
+    """
+    if orjson is not None:
+        try:
+            if pretty:
+                return orjson.dumps(
+                    obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2)
+            return orjson.dumps(obj)
+        except TypeError:
+            pass
+    if pretty:
+        return json.dumps(obj, sort_keys=True, indent=2,
+                          ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'),
+                      ensure_ascii=False).encode('utf-8')
+
+
+def json_loads(data):
+    """
+    Deserialize JSON bytes (or str) and returns the python object.
+
+    orjson is used if it is installed, falling back to the standard json
+    module for documents that orjson refuses (e.g. lone surrogates).
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            pass
+    return json.loads(data)
+
+
+def b64decode(data):
+    """
+    Decode base64 data (bytes or ascii str) and returns the decoded bytes.
+
+    pybase64 (SIMD accelerated) is used if it is installed, else the C
+    implementation of binascii is called directly.
+    """
+    if pybase64 is not None:
+        return pybase64.b64decode(data, validate=False)
+    return binascii.a2b_base64(data)
+
+
+def b64decode_to(data, stream, chunk_size=64 * 1024):
+    """
+    Decode base64 data (bytes or ascii str, without line breaks) and write
+    the decoded bytes to a binary stream, chunk by chunk, so the whole
+    decoded data is never held in memory. Chunks are decoded with
+    :func:`b64decode`, so pybase64 is used if it is installed.
+
+    :param chunk_size: number of base64 characters decoded at once, must be
+                       a multiple of 4.
+    """
+    if chunk_size % 4:
+        raise ValueError(f'chunk_size must be a multiple of 4'
+                         f' - got {chunk_size}')
+    decode = b64decode
+    write = stream.write
+    for i in range(0, len(data), chunk_size):
+        write(decode(data[i:i + chunk_size]))
+
+
 def is_exe(fpath):
     """
     Returns True if fpath is an executable file
@@ -20,6 +20,11 @@ version = re.search("__version__ = '(.+)'", read('funq/__init__.py')).group(1)
 # mais tres utile pour cadrer les tests.
 install_requires = ['nose']
 
+extras_require = {
+    # faster json and base64 decoding of the libFunq messages
+    'speedups': ['orjson', 'pybase64'],
+}
+
 setup(
     name="funq",
     author="Julien Pagès",
@@ -32,6 +37,7 @@ setup(
     zip_safe=False,
     test_suite='funq.tests.create_test_suite',
     install_requires=install_requires,
+    extras_require=extras_require,
     package_data={'funq': ['aliases-gkits.conf']},
     entry_points={
         'nose.plugins.0.10': ['funq = funq.noseplugin:FunqPlugin']
@@ -37,6 +37,7 @@ knowledge of the CeCILL v2.1 license and that you accept its terms.
 #include "dragndropresponse.h"
 #include "objectpath.h"
 #include "shortcutresponse.h"
+#include "waitforpropertiesresponse.h"
 
 #include <QAbstractItemModel>
 #include <QAbstractItemView>
@@ -245,6 +246,13 @@ Player::Player(QIODevice * device, QObject * parent)
     : JsonClient(device, parent) {
 }
 
+QPixmap render_graphics_view(QGraphicsView * view) {
+    QPixmap pixmap(view->scene()->width(), view->scene()->height());
+    QPainter q_painter(&pixmap);
+    view->scene()->render(&q_painter);
+    return pixmap;
+}
+
 qulonglong Player::registerObject(QObject * object) {
     if (!object) {
         return 0;
@@ -336,6 +344,23 @@ QtJson::JsonObject Player::quick_item_find(const QtJson::JsonObject & command) {
     return result;
 }
 
+QtJson::JsonObject Player::quick_item_find_batch(
+    const QtJson::JsonObject & command) {
+    QtJson::JsonArray items;
+    foreach (const QVariant & query, command["queries"].toList()) {
+        QtJson::JsonObject itemCommand = query.toMap();
+        itemCommand["quick_window_oid"] = command["quick_window_oid"];
+        QtJson::JsonObject item = quick_item_find(itemCommand);
+        if (item.contains("errName")) {
+            return item;
+        }
+        items << item;
+    }
+    QtJson::JsonObject result;
+    result["items"] = items;
+    return result;
+}
+
 QtJson::JsonObject Player::active_widget(const QtJson::JsonObject & command) {
     QObject * active;
     QString type = command["type"].toString();
@@ -420,6 +445,31 @@ QtJson::JsonObject Player::object_properties(
     return result;
 }
 
+QtJson::JsonObject Player::object_property(
+    const QtJson::JsonObject & command) {
+    ObjectLocatorContext ctx(this, command, "oid");
+    if (ctx.hasError()) {
+        return ctx.lastError;
+    }
+    QString name = command["name"].toString();
+    QVariant value = ctx.obj->property(name.toUtf8());
+    bool success = false;
+    if (value.isValid()) {
+        QtJson::serialize(value, success);
+    }
+    if (!success) {
+        return createError(
+            "MissingProperty",
+            QString::fromUtf8("The object (id:%1) has no serializable "
+                              "property %2")
+                .arg(ctx.id)
+                .arg(name));
+    }
+    QtJson::JsonObject result;
+    result["value"] = value;
+    return result;
+}
+
 QtJson::JsonObject Player::object_set_properties(
     const QtJson::JsonObject & command) {
     ObjectLocatorContext ctx(this, command, "oid");
@@ -432,6 +482,11 @@ QtJson::JsonObject Player::object_set_properties(
     return result;
 }
 
+DelayedResponse * Player::wait_for_properties(
+    const QtJson::JsonObject & command) {
+    return new WaitForPropertiesResponse(this, command);
+}
+
 void Player::_object_set_properties(QObject * object,
                                     const QVariantMap & properties) {
     for (QtJson::JsonObject::const_iterator iter = properties.begin();
@@ -733,6 +788,34 @@ QtJson::JsonObject Player::model_items(const QtJson::JsonObject & command) {
     return result;
 }
 
+QtJson::JsonObject Player::model_find_row(const QtJson::JsonObject & command) {
+    ObjectLocatorContext ctx(this, command, "oid");
+    if (ctx.hasError()) {
+        return ctx.lastError;
+    }
+
+    QAbstractItemModel * model = qobject_cast<QAbstractItemModel *>(ctx.obj);
+    if (!model) {
+        return createError(
+            "NotAModel",
+            QString("Object with id `%1` is not a QAbstractItemModel")
+                .arg(ctx.id));
+    }
+
+    int column = command["column"].toInt();
+    QString value = command["value"].toString();
+    int found = -1;
+    for (int row = 0; row < model->rowCount(); ++row) {
+        if (model->data(model->index(row, column)).toString() == value) {
+            found = row;
+            break;
+        }
+    }
+    QtJson::JsonObject result;
+    result["row"] = found;
+    return result;
+}
+
 QtJson::JsonObject Player::model_item_action(
     const QtJson::JsonObject & command) {
     WidgetLocatorContext<QAbstractItemView> ctx(this, command, "oid");
@@ -746,16 +829,46 @@ QtJson::JsonObject Player::model_item_action(
             QString::fromUtf8("The view (id:%1) has no associated model")
                 .arg(ctx.id));
     }
+    return _model_item_action(ctx.widget, model, command, command);
+}
+
+QtJson::JsonObject Player::model_item_actions(
+    const QtJson::JsonObject & command) {
+    WidgetLocatorContext<QAbstractItemView> ctx(this, command, "oid");
+    if (ctx.hasError()) {
+        return ctx.lastError;
+    }
+    QAbstractItemModel * model = ctx.widget->model();
+    if (!model) {
+        return createError(
+            "MissingModel",
+            QString::fromUtf8("The view (id:%1) has no associated model")
+                .arg(ctx.id));
+    }
+    foreach (const QVariant & item, command["items"].toList()) {
+        QtJson::JsonObject result =
+            _model_item_action(ctx.widget, model, command, item.toMap());
+        if (result.contains("errName")) {
+            return result;
+        }
+    }
+    QtJson::JsonObject result;
+    return result;
+}
+
+QtJson::JsonObject Player::_model_item_action(
+    QAbstractItemView * view, QAbstractItemModel * model,
+    const QtJson::JsonObject & command, const QtJson::JsonObject & item) {
     QModelIndex index =
-        get_model_item(model, command["itempath"].toString(),
-                       command["row"].toInt(), command["column"].toInt());
+        get_model_item(model, item["itempath"].toString(),
+                       item["row"].toInt(), item["column"].toInt());
     if (!index.isValid()) {
         return createError(
             "MissingModelItem",
             QString::fromUtf8("Unable to find an item identified by %1")
-                .arg(command["itempath"].toString()));
+                .arg(item["itempath"].toString()));
     }
-    ctx.widget->scrollTo(index);  // item visible
+    view->scrollTo(index);  // item visible
     QString itemaction = command["itemaction"].toString();
 
     QPoint cursorPosition;
@@ -764,7 +877,7 @@ QtJson::JsonObject Player::model_item_action(
         QString origin = command["origin"].toString();
         int offsetX = command["offset_x"].toInt();
         int offsetY = command["offset_y"].toInt();
-        QRect visualRect = ctx.widget->visualRect(index);
+        QRect visualRect = view->visualRect(index);
         cursorPosition = visualRect.center();
         if (origin == "left") {
             cursorPosition.setX(visualRect.x());
@@ -790,17 +903,18 @@ QtJson::JsonObject Player::model_item_action(
     }
 
     if (itemaction == "select") {
-        _model_item_action(itemaction, ctx.widget, index);
+        view->setCurrentIndex(index);
     } else if (itemaction == "edit") {
-        _model_item_action(itemaction, ctx.widget, index);
+        view->setCurrentIndex(index);
+        view->edit(index);
     } else if (itemaction == "click") {
-        mouse_click(ctx.widget->viewport(), cursorPosition, Qt::LeftButton);
+        mouse_click(view->viewport(), cursorPosition, Qt::LeftButton);
     } else if (itemaction == "rightclick") {
-        mouse_click(ctx.widget->viewport(), cursorPosition, Qt::RightButton);
+        mouse_click(view->viewport(), cursorPosition, Qt::RightButton);
     } else if (itemaction == "middleclick") {
-        mouse_click(ctx.widget->viewport(), cursorPosition, Qt::MiddleButton);
+        mouse_click(view->viewport(), cursorPosition, Qt::MiddleButton);
     } else if (itemaction == "doubleclick") {
-        mouse_dclick(ctx.widget->viewport(), cursorPosition);
+        mouse_dclick(view->viewport(), cursorPosition);
     } else {
         return createError(
             "MissingItemAction",
@@ -810,15 +924,26 @@ QtJson::JsonObject Player::model_item_action(
     return result;
 }
 
-void Player::_model_item_action(const QString & action,
-                                QAbstractItemView * widget,
-                                const QModelIndex & index) {
-    if (action == "select") {
-        widget->setCurrentIndex(index);
-    } else if (action == "edit") {
-        widget->setCurrentIndex(index);
-        widget->edit(index);
+QtJson::JsonObject Player::find_editor(const QtJson::JsonObject & command) {
+    WidgetLocatorContext<QAbstractItemView> ctx(this, command, "oid");
+    if (ctx.hasError()) {
+        return ctx.lastError;
+    }
+    QString prefix = objectPath(ctx.widget) + "::qt_scrollarea_viewport::";
+    QStringList classes = command["classes"].toStringList();
+    foreach (const QString & className, classes) {
+        QObject * editor = findObject(prefix + className);
+        if (editor) {
+            QtJson::JsonObject result;
+            result["oid"] = registerObject(editor);
+            dump_object(editor, result);
+            return result;
+        }
     }
+    return createError(
+        "MissingEditor",
+        QString::fromUtf8("Unable to find an editor. Possible editors: %1")
+            .arg(classes.join(", ")));
 }
 
 QtJson::JsonObject Player::model_gitem_action(
@@ -948,6 +1073,18 @@ QtJson::JsonObject Player::tabbar_list(const QtJson::JsonObject & command) {
     return result;
 }
 
+QtJson::JsonObject Player::combobox_find_text(
+    const QtJson::JsonObject & command) {
+    WidgetLocatorContext<QComboBox> ctx(this, command, "oid");
+    if (ctx.hasError()) {
+        return ctx.lastError;
+    }
+    QtJson::JsonObject result;
+    result["row"] = ctx.widget->findText(
+        command["text"].toString(), Qt::MatchExactly | Qt::MatchCaseSensitive);
+    return result;
+}
+
 QtJson::JsonObject Player::headerview_list(const QtJson::JsonObject & command) {
     WidgetLocatorContext<QHeaderView> ctx(this, command, "oid");
     if (ctx.hasError()) {
@@ -991,10 +1128,21 @@ QtJson::JsonObject Player::headerview_click(
                     .arg(ctx.id));
         }
         bool found = false;
+        if (command.contains("logicalIndex")) {
+            // the name was resolved by the client, from texts that may be
+            // outdated: only trust it if it still designates this name.
+            int hint = command["logicalIndex"].toInt();
+            if (hint >= 0 && hint < ctx.widget->count() &&
+                name == model->headerData(hint, ctx.widget->orientation())
+                            .toString()) {
+                logicalIndex = hint;
+                found = true;
+            }
+        }
         int nbItems = ctx.widget->orientation() == Qt::Horizontal
             ? model->rowCount()
             : model->columnCount();
-        for (int i = 0; i < nbItems; i++) {
+        for (int i = 0; !found && i < nbItems; i++) {
             if (name ==
                 model->headerData(i, ctx.widget->orientation()).toString()) {
                 logicalIndex = i;
@@ -1162,10 +1310,7 @@ QtJson::JsonObject Player::grab_graphics_view(
     if (format.isEmpty()) {
         format = "PNG";
     }
-    QPixmap pixmap(ctx.widget->scene()->width(), ctx.widget->scene()->height());
-    QPainter q_painter(&pixmap);
-
-    ctx.widget->scene()->render(&q_painter);
+    QPixmap pixmap = render_graphics_view(ctx.widget);
     QBuffer buffer;
     pixmap.save(&buffer, format.toStdString().c_str());
 
@@ -1175,3 +1320,27 @@ QtJson::JsonObject Player::grab_graphics_view(
 
     return result;
 }
+
+QtJson::JsonObject Player::grab_graphics_view_to_file(
+    const QtJson::JsonObject & command) {
+    WidgetLocatorContext<QGraphicsView> ctx(this, command, "oid");
+    if (ctx.hasError()) {
+        return ctx.lastError;
+    }
+    QString format = command["format"].toString();
+    if (format.isEmpty()) {
+        format = "PNG";
+    }
+    QString path = command["path"].toString();
+    QPixmap pixmap = render_graphics_view(ctx.widget);
+    if (!pixmap.save(path, format.toStdString().c_str())) {
+        return createError(
+            "GrabError",
+            QString::fromUtf8("Unable to save the grabbed scene to %1")
+                .arg(path));
+    }
+
+    QtJson::JsonObject result;
+    result["format"] = format;
+    return result;
+}
@@ -40,6 +40,7 @@ knowledge of the CeCILL v2.1 license and that you accept its terms.
 #include <QModelIndex>
 #include <QWidget>
 class DelayedResponse;
+class QAbstractItemModel;
 class QAbstractItemView;
 class QQuickItem;
 class QQuickWindow;
@@ -78,8 +79,10 @@ public slots:
     QtJson::JsonObject widget_by_path(const QtJson::JsonObject & command);
     QtJson::JsonObject active_widget(const QtJson::JsonObject & command);
     QtJson::JsonObject object_properties(const QtJson::JsonObject & command);
+    QtJson::JsonObject object_property(const QtJson::JsonObject & command);
     QtJson::JsonObject object_set_properties(
         const QtJson::JsonObject & command);
+    DelayedResponse * wait_for_properties(const QtJson::JsonObject & command);
     QtJson::JsonObject actions_list(const QtJson::JsonObject & command);
     QtJson::JsonObject action_trigger(const QtJson::JsonObject & command);
     QtJson::JsonObject widgets_list(const QtJson::JsonObject & command);
@@ -91,12 +94,16 @@ public slots:
     DelayedResponse * drag_n_drop(const QtJson::JsonObject & command);
     QtJson::JsonObject model(const QtJson::JsonObject & command);
     QtJson::JsonObject model_items(const QtJson::JsonObject & command);
+    QtJson::JsonObject model_find_row(const QtJson::JsonObject & command);
     QtJson::JsonObject model_item_action(const QtJson::JsonObject & command);
+    QtJson::JsonObject model_item_actions(const QtJson::JsonObject & command);
     QtJson::JsonObject model_gitem_action(const QtJson::JsonObject & command);
+    QtJson::JsonObject find_editor(const QtJson::JsonObject & command);
     QtJson::JsonObject grab(const QtJson::JsonObject & command);
     QtJson::JsonObject widget_keyclick(const QtJson::JsonObject & command);
     DelayedResponse * shortcut(const QtJson::JsonObject & command);
     QtJson::JsonObject tabbar_list(const QtJson::JsonObject & command);
+    QtJson::JsonObject combobox_find_text(const QtJson::JsonObject & command);
     QtJson::JsonObject graphicsitems(const QtJson::JsonObject & command);
     QtJson::JsonObject gitem_properties(const QtJson::JsonObject & command);
     QtJson::JsonObject call_slot(const QtJson::JsonObject & command);
@@ -107,10 +114,14 @@ public slots:
     QtJson::JsonObject headerview_path_from_view(
         const QtJson::JsonObject & command);
     QtJson::JsonObject grab_graphics_view(const QtJson::JsonObject & command);
+    QtJson::JsonObject grab_graphics_view_to_file(
+        const QtJson::JsonObject & command);
 
     QtJson::JsonObject quit(const QtJson::JsonObject & command);
 
     QtJson::JsonObject quick_item_find(const QtJson::JsonObject & command);
+    QtJson::JsonObject quick_item_find_batch(
+        const QtJson::JsonObject & command);
     QtJson::JsonObject quick_item_click(const QtJson::JsonObject & command);
 
 protected:
@@ -122,8 +133,10 @@ protected:
 
 private:
     void _object_set_properties(QObject * object, const QVariantMap & props);
-    void _model_item_action(const QString &, QAbstractItemView *,
-                            const QModelIndex &);
+    QtJson::JsonObject _model_item_action(QAbstractItemView * view,
+                                          QAbstractItemModel * model,
+                                          const QtJson::JsonObject & command,
+                                          const QtJson::JsonObject & item);
 
 private slots:
     void objectDeleted(QObject * object);
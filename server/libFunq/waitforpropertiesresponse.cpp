@@ -0,0 +1,89 @@
+/*
+Copyright: SCLE SFE
+Contributor: Julien Pagès <j.parkouss@gmail.com>
+
+This software is a computer program whose purpose is to test graphical
+applications written with the QT framework (http://qt.digia.com/).
+
+This software is governed by the CeCILL v2.1 license under French law and
+abiding by the rules of distribution of free software.  You can  use,
+modify and/ or redistribute the software under the terms of the CeCILL
+license as circulated by CEA, CNRS and INRIA at the following URL
+"http://www.cecill.info".
+
+As a counterpart to the access to the source code and  rights to copy,
+modify and redistribute granted by the license, users are provided only
+with a limited warranty  and the software's author,  the holder of the
+economic rights,  and the successive licensors  have only  limited
+liability.
+
+In this respect, the user's attention is drawn to the risks associated
+with loading,  using,  modifying and/or developing or reproducing the
+software by the user in light of its specific status of free software,
+that may mean  that it is complicated to manipulate,  and  that  also
+therefore means  that it is reserved for developers  and  experienced
+professionals having in-depth computer knowledge. Users are therefore
+encouraged to load and test the software's suitability as regards their
+requirements in conditions enabling the security of their systems and/or
+data to be ensured and,  more generally, to use and operate it in the
+same conditions as regards security.
+
+The fact that you are presently reading this means that you have had
+knowledge of the CeCILL v2.1 license and that you accept its terms.
+*/
+
+#include "waitforpropertiesresponse.h"
+
+#include "player.h"
+
+WaitForPropertiesResponse::WaitForPropertiesResponse(
+    JsonClient * client, const QtJson::JsonObject & command)
+    : DelayedResponse(client, command, 0,
+                      qRound(command["timeout"].toDouble() * 1000) + 5000),
+      m_interval(qRound(command["interval"].toDouble() * 1000)),
+      m_timeout(qRound64(command["timeout"].toDouble() * 1000)) {
+    ObjectLocatorContext ctx(static_cast<Player *>(jsonClient()), command,
+                             "oid");
+    if (ctx.hasError()) {
+        writeResponse(ctx.lastError);
+        return;
+    }
+    m_object = ctx.obj;
+    m_props = command["props"].value<QVariantMap>();
+    m_elapsed.start();
+}
+
+bool WaitForPropertiesResponse::propertiesMatch() {
+    for (QVariantMap::const_iterator iter = m_props.constBegin();
+         iter != m_props.constEnd(); ++iter) {
+        QVariant value = m_object->property(iter.key().toUtf8().constData());
+        // go through json so the value is typed like the expected one
+        bool success = false;
+        QByteArray serialized = QtJson::serialize(value, success);
+        QVariant normalized;
+        if (success) {
+            normalized = QtJson::parse(QString::fromUtf8(serialized));
+        }
+        if (normalized != iter.value()) {
+            return false;
+        }
+    }
+    return true;
+}
+
+void WaitForPropertiesResponse::execute(int call) {
+    if (!m_object) {
+        writeResponse(jsonClient()->createError(
+            "NotRegisteredObject", "The object has been destroyed"));
+        return;
+    }
+    bool match = propertiesMatch();
+    if (match || m_elapsed.elapsed() >= m_timeout) {
+        QtJson::JsonObject result;
+        result["result"] = match;
+        writeResponse(result);
+    } else if (call == 0) {
+        // the first check is done right away, next ones every interval
+        setInterval(m_interval);
+    }
+}
@@ -94,10 +94,8 @@ class build_libfunq(Command):
         subprocess.check_call(make_cmd, shell=True)
 
         lib_path = self.funqlib_out_path()
-        lib_dir = os.path.dirname(lib_path)
-        if not os.path.isdir(lib_dir):
-            os.makedirs(lib_dir)
-        shutil.copy2(os.path.join('libFunq', self.funqlib_name), lib_path)
+        os.makedirs(os.path.dirname(lib_path), exist_ok=True)
+        shutil.copyfile(os.path.join('libFunq', self.funqlib_name), lib_path)
 
     def get_outputs(self):
         return [self.funqlib_out_path()]
@@ -33,16 +33,20 @@ knowledge of the CeCILL v2.1 license and that you accept its terms.
 */
 
 #include <QBuffer>
+#include <QComboBox>
+#include <QElapsedTimer>
 #include <QGraphicsRectItem>
 #include <QGraphicsScene>
 #include <QGraphicsView>
 #include <QHBoxLayout>
 #include <QHeaderView>
+#include <QImage>
 #include <QLineEdit>
 #include <QMainWindow>
 #include <QObject>
 #include <QPushButton>
 #include <QShortcut>
+#include <QSpinBox>
 #include <QSignalSpy>
 #include <QStandardItem>
 #include <QStandardItemModel>
@@ -50,6 +54,7 @@ knowledge of the CeCILL v2.1 license and that you accept its terms.
 #include <QTableView>
 #include <QTableWidget>
 #include <QTableWidgetItem>
+#include <QTemporaryDir>
 #include <QtTest/QtTest>
 
 #ifdef QT_QUICK_LIB
@@ -279,6 +284,25 @@ private slots:
         QCOMPARE(result["objectName"].toString(), QString("toto"));
     }
 
+    void test_player_object_property() {
+        QObject o;
+        o.setObjectName("toto");
+
+        QBuffer buffer;
+        Player player(&buffer);
+
+        QtJson::JsonObject command;
+        command["oid"] = player.registerObject(&o);
+        command["name"] = "objectName";
+
+        QtJson::JsonObject result = player.object_property(command);
+        QCOMPARE(result["value"].toString(), QString("toto"));
+
+        command["name"] = "notAProperty";
+        result = player.object_property(command);
+        QCOMPARE(result["errName"].toString(), QString("MissingProperty"));
+    }
+
     void test_player_not_registered_object() {
         QMainWindow w;
         QObject o(&w);
@@ -367,6 +391,109 @@ private slots:
         QCOMPARE(o.objectName(), QString("titi"));
     }
 
+    void test_player_wait_for_properties() {
+        QMainWindow w;
+        QObject o(&w);
+        o.setObjectName("toto");
+
+        QBuffer buffer;
+
+        Player player(&buffer);
+
+        QtJson::JsonObject commandPath;
+        commandPath["path"] = "QMainWindow::toto";
+
+        QtJson::JsonObject resultPath = player.widget_by_path(commandPath);
+
+        QtJson::JsonObject command, props;
+        props["objectName"] = "titi";
+        command["oid"] = resultPath["oid"];
+        command["props"] = props;
+        command["timeout"] = 5.0;
+        command["interval"] = 0.01;
+
+        DelayedResponse * dresponse = player.wait_for_properties(command);
+        QtJson::JsonObject result;
+        QEventLoop loop;
+        QObject::connect(dresponse, &DelayedResponse::aboutToWriteResponse,
+                         [&](const QtJson::JsonObject & response) {
+                             result = response;
+                             loop.quit();
+                         });
+        dresponse->start();
+        o.setObjectName("titi");
+        loop.exec();
+
+        QCOMPARE(result["result"].toBool(), true);
+    }
+
+    void test_player_wait_for_properties_already_match() {
+        QObject o;
+        o.setObjectName("toto");
+
+        QBuffer buffer;
+        Player player(&buffer);
+
+        QtJson::JsonObject command, props;
+        props["objectName"] = "toto";
+        command["oid"] = player.registerObject(&o);
+        command["props"] = props;
+        command["timeout"] = 10.0;
+        command["interval"] = 5.0;
+
+        DelayedResponse * dresponse = player.wait_for_properties(command);
+        QtJson::JsonObject result;
+        QEventLoop loop;
+        QObject::connect(dresponse, &DelayedResponse::aboutToWriteResponse,
+                         [&](const QtJson::JsonObject & response) {
+                             result = response;
+                             loop.quit();
+                         });
+        QElapsedTimer elapsed;
+        elapsed.start();
+        dresponse->start();
+        loop.exec();
+
+        // the first check does not wait for the interval
+        QVERIFY(elapsed.elapsed() < 1000);
+        QCOMPARE(result["result"].toBool(), true);
+    }
+
+    void test_player_wait_for_properties_timeout() {
+        QMainWindow w;
+        QObject o(&w);
+        o.setObjectName("toto");
+
+        QBuffer buffer;
+
+        Player player(&buffer);
+
+        QtJson::JsonObject commandPath;
+        commandPath["path"] = "QMainWindow::toto";
+
+        QtJson::JsonObject resultPath = player.widget_by_path(commandPath);
+
+        QtJson::JsonObject command, props;
+        props["objectName"] = "titi";
+        command["oid"] = resultPath["oid"];
+        command["props"] = props;
+        command["timeout"] = 0.1;
+        command["interval"] = 0.01;
+
+        DelayedResponse * dresponse = player.wait_for_properties(command);
+        QtJson::JsonObject result;
+        QEventLoop loop;
+        QObject::connect(dresponse, &DelayedResponse::aboutToWriteResponse,
+                         [&](const QtJson::JsonObject & response) {
+                             result = response;
+                             loop.quit();
+                         });
+        dresponse->start();
+        loop.exec();
+
+        QCOMPARE(result["result"].toBool(), false);
+    }
+
     void test_player_widgets_list() {
         QMainWindow mw;
         QWidget w(&mw);
@@ -721,6 +848,21 @@ private slots:
         qApp->processEvents();
         QCOMPARE(hspy.count(), 1);
         QCOMPARE(hspy.first().first().toInt(), 1);
+
+        // a logical index still designating the name is used
+        command["indexOrName"] = "C3";
+        command["logicalIndex"] = 2;
+        result = player.headerview_click(command);
+        qApp->processEvents();
+        QCOMPARE(hspy.count(), 2);
+        QCOMPARE(hspy.last().first().toInt(), 2);
+
+        // an outdated logical index is ignored, the name is searched
+        command["indexOrName"] = "C2";
+        result = player.headerview_click(command);
+        qApp->processEvents();
+        QCOMPARE(hspy.count(), 3);
+        QCOMPARE(hspy.last().first().toInt(), 1);
     }
 
     void test_player_model_items() {
@@ -759,6 +901,132 @@ private slots:
         QCOMPARE(items.count(), 4 * 4);
     }
 
+    void test_player_model_find_row() {
+        QStandardItemModel model(3, 2);
+        model.setItem(1, 1, new QStandardItem("b"));
+        model.setItem(2, 1, new QStandardItem("b"));
+
+        QBuffer buffer;
+        Player player(&buffer);
+
+        QtJson::JsonObject command;
+        command["oid"] = player.registerObject(&model);
+        command["column"] = 1;
+        command["value"] = "b";
+        QCOMPARE(player.model_find_row(command)["row"].toInt(), 1);
+
+        command["column"] = 0;
+        QCOMPARE(player.model_find_row(command)["row"].toInt(), -1);
+    }
+
+    void test_player_model_item_actions() {
+        QMainWindow mw;
+        QTableView view(&mw);
+        QStandardItemModel model(3, 2);
+        view.setModel(&model);
+        view.setSelectionMode(QAbstractItemView::MultiSelection);
+
+        QBuffer buffer;
+        Player player(&buffer);
+
+        QtJson::JsonObject commandPath;
+        commandPath["path"] = "QMainWindow::QTableView";
+        QtJson::JsonObject resultPath = player.widget_by_path(commandPath);
+
+        QVariantList items;
+        for (int row = 0; row < 3; ++row) {
+            QtJson::JsonObject item;
+            item["row"] = row;
+            item["column"] = 1;
+            items << item;
+        }
+
+        QtJson::JsonObject command;
+        command["oid"] = resultPath["oid"];
+        command["itemaction"] = "select";
+        command["items"] = items;
+
+        QtJson::JsonObject result = player.model_item_actions(command);
+        QVERIFY(!result.contains("errName"));
+        QCOMPARE(view.currentIndex(), model.index(2, 1));
+
+        QtJson::JsonObject missing;
+        missing["row"] = 5;
+        missing["column"] = 0;
+        command["items"] = QVariantList() << items.first() << missing;
+        result = player.model_item_actions(command);
+        QCOMPARE(result["errName"].toString(), QString("MissingModelItem"));
+    }
+
+    void test_player_combobox_find_text() {
+        QComboBox combo;
+        combo.setObjectName("combo");
+        combo.addItems(QStringList() << "first"
+                                     << "second");
+
+        QBuffer buffer;
+        Player player(&buffer);
+
+        QtJson::JsonObject commandPath;
+        commandPath["path"] = "combo";
+        QtJson::JsonObject resultPath = player.widget_by_path(commandPath);
+
+        QtJson::JsonObject command;
+        command["oid"] = resultPath["oid"];
+        command["text"] = "second";
+        QCOMPARE(player.combobox_find_text(command)["row"].toInt(), 1);
+
+        command["text"] = "Second";
+        QCOMPARE(player.combobox_find_text(command)["row"].toInt(), -1);
+    }
+
+    void test_player_grab_graphics_view_to_file() {
+        QGraphicsScene scene(0, 0, 20, 10);
+        QGraphicsView view(&scene);
+
+        QBuffer buffer;
+        Player player(&buffer);
+
+        QTemporaryDir dir;
+        QVERIFY(dir.isValid());
+
+        QtJson::JsonObject command;
+        command["oid"] = player.registerObject(&view);
+        command["path"] = dir.path() + "/scene.png";
+
+        QtJson::JsonObject result = player.grab_graphics_view_to_file(command);
+        QCOMPARE(result["format"].toString(), QString("PNG"));
+        QImage image(dir.path() + "/scene.png");
+        QCOMPARE(image.size(), QSize(20, 10));
+    }
+
+    void test_player_find_editor() {
+        QMainWindow mw;
+        QTableView view(&mw);
+        QStandardItemModel model(2, 2);
+        view.setModel(&model);
+
+        QBuffer buffer;
+        Player player(&buffer);
+
+        QtJson::JsonObject commandPath;
+        commandPath["path"] = "QMainWindow::QTableView";
+        QtJson::JsonObject resultPath = player.widget_by_path(commandPath);
+
+        QtJson::JsonObject command;
+        command["oid"] = resultPath["oid"];
+        command["classes"] = QStringList() << "QLineEdit"
+                                           << "QSpinBox";
+
+        QtJson::JsonObject result = player.find_editor(command);
+        QCOMPARE(result["errName"].toString(), QString("MissingEditor"));
+
+        QSpinBox editor(view.viewport());
+        result = player.find_editor(command);
+        QCOMPARE(player.registeredObject(result["oid"].value<qulonglong>()),
+                 &editor);
+    }
+
 #if QT_VERSION < 0x050000
     /* TODO: this test crash on ubuntu Using Qt version 5.2.1 in
      * /usr/lib/x86_64-linux-gnu */
@@ -906,6 +1174,40 @@ private slots:
         QCOMPARE(result["errName"].toString(), QString("InvalidQuickItem"));
     }
 
+    void test_quick_item_find_batch() {
+        QQuickView view;
+        view.setSource(QUrl::fromLocalFile(SOURCE_DIR "find_by_id.qml"));
+        view.show();
+        QVERIFY(QTest::qWaitForWindowExposed(&view));
+
+        QBuffer buffer;
+        Player player(&buffer);
+
+        QtJson::JsonObject root;
+        root["qid"] = "root";
+        QtJson::JsonObject rect;
+        rect["qid"] = "rect";
+
+        QtJson::JsonObject command;
+        command["quick_window_oid"] = player.registerObject(&view);
+        command["queries"] = QVariantList() << root << rect;
+
+        QtJson::JsonObject result = player.quick_item_find_batch(command);
+        QVariantList items = result["items"].toList();
+        QCOMPARE(items.count(), 2);
+        QQuickItem * item =
+            (QQuickItem *)items.at(1).toMap()["oid"].value<qulonglong>();
+        QCOMPARE(item->property("objectName").toString(), QString("MyRect"));
+
+        // the first missing item gives the error
+        QtJson::JsonObject missing;
+        missing["qid"] = "rootrect";
+        command["queries"] = QVariantList() << root << missing;
+
+        result = player.quick_item_find_batch(command);
+        QCOMPARE(result["errName"].toString(), QString("InvalidQuickItem"));
+    }
+
 #if QT_VERSION_MAJOR < 6
     void test_quick_item_click() {
         QQuickView view;